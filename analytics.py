@@ -0,0 +1,63 @@
+"""Firing analytics shared by the Streamlit app and the batch reports.
+
+Nothing here touches ``st.session_state``, so these helpers can run in
+report worker processes as well as inside the app.
+"""
+
+ZONES = ['top', 'middle', 'bottom']
+
+
+def get_health_status(component_data, live_alerts=None):
+    """Get health status for hardware components, escalated by live telemetry alerts.
+
+    A relay fault, or any alert that has persisted, is a hard failure and
+    reads as Replace Soon whatever the wear; other alerts mean Monitor.
+    """
+    live_alerts = live_alerts or []
+    usage = (component_data['firing_count'] / component_data['max_life']) * 100
+    failing = any(alert['kind'] == 'relay' or alert.get('persistent') for alert in live_alerts)
+    if usage < 60 and not live_alerts:
+        return {'color': 'green', 'status': 'Excellent', 'emoji': '✅'}
+    elif usage < 85 and not failing:
+        return {'color': 'orange', 'status': 'Monitor', 'emoji': '⚠️'}
+    else:
+        return {'color': 'red', 'status': 'Replace Soon', 'emoji': '🚨'}
+
+
+def is_successful(firing):
+    """A firing counts as a success when its result was logged as perfect or good"""
+    return any(word in firing.get('actual_result', '').lower() for word in ['perfect', 'good'])
+
+
+def summarize_firings(firings):
+    """Success, offset, clay body and firing type totals in a single pass.
+
+    ``firings`` may be any iterable, including a lazily paged history.
+    """
+    summary = {
+        'total': 0,
+        'success_count': 0,
+        'offset_totals': {zone: 0 for zone in ZONES},
+        'clay_counts': {},
+        'clay_successes': {},
+        'type_counts': {}
+    }
+    for f in firings:
+        success = is_successful(f)
+        summary['total'] += 1
+        summary['success_count'] += success
+        for zone in ZONES:
+            summary['offset_totals'][zone] += f['zone_offsets'][zone]
+        if f.get('clay_body'):
+            clay = f['clay_body']
+            summary['clay_counts'][clay] = summary['clay_counts'].get(clay, 0) + 1
+            summary['clay_successes'][clay] = summary['clay_successes'].get(clay, 0) + success
+        ftype = f.get('firing_type', 'unknown')
+        summary['type_counts'][ftype] = summary['type_counts'].get(ftype, 0) + 1
+
+    total = summary['total']
+    summary['success_rate'] = (summary['success_count'] / total) * 100 if total else 0
+    summary['avg_offsets'] = {
+        zone: (summary['offset_totals'][zone] / total) if total else 0 for zone in ZONES
+    }
+    return summary
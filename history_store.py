@@ -0,0 +1,131 @@
+"""Bounded firing history for KilnMaster Pro.
+
+Only the most recent firings are kept in memory. Everything older is
+spilled to append-only JSON Lines segment files and read back lazily
+when a full-history view or export asks for it.
+
+Eviction policy: strictly first-in, first-out by logging order. When an
+append pushes the hot window past ``window_size`` the oldest firing is
+written to the end of the current segment, and a new segment is started
+once the current one holds ``segment_size`` records. Spilled firings are
+never loaded back into the window, so memory stays bounded no matter
+how long a studio has been logging.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import warnings
+import weakref
+from collections import deque
+
+DEFAULT_SEGMENT_SIZE = 1000
+
+# Firings shown in the Recent Firings list; the in-memory window must cover it
+RECENT_FIRINGS_SHOWN = 10
+
+
+def _window_size_from_env(default=50):
+    """Read KILNMASTER_HISTORY_WINDOW, falling back to ``default`` on bad values"""
+    value = os.environ.get('KILNMASTER_HISTORY_WINDOW')
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        warnings.warn(f"Ignoring KILNMASTER_HISTORY_WINDOW={value!r}: not a whole number; using {default}")
+        return default
+
+
+DEFAULT_WINDOW_SIZE = _window_size_from_env()
+# The window the app and load harness actually use
+HISTORY_WINDOW = max(DEFAULT_WINDOW_SIZE, RECENT_FIRINGS_SHOWN)
+
+
+class FiringHistory:
+    """Hot window of recent firings backed by an on-disk segment store"""
+
+    def __init__(self, window_size=HISTORY_WINDOW, segment_size=DEFAULT_SEGMENT_SIZE, directory=None):
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+        if segment_size < 1:
+            raise ValueError("segment_size must be at least 1")
+
+        self.window_size = window_size
+        self.segment_size = segment_size
+        self._window = deque()
+        self._segments = []  # [path, record_count] in logging order
+        self._spilled = 0
+
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix='kilnmaster-history-')
+            # Session-scoped spill files go away with the session
+            self._cleanup = weakref.finalize(self, shutil.rmtree, directory, True)
+        else:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+    def __len__(self):
+        """Total number of firings, spilled and hot"""
+        return self._spilled + len(self._window)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        return self.iter_all()
+
+    @property
+    def spilled_count(self):
+        return self._spilled
+
+    def append(self, firing):
+        self._window.append(firing)
+        self._evict()
+
+    def extend(self, firings):
+        for firing in firings:
+            self._window.append(firing)
+            # Spill a whole segment at a time while bulk loading
+            if len(self._window) >= self.window_size + self.segment_size:
+                self._evict()
+        self._evict()
+
+    def recent(self, count=None):
+        """The newest ``count`` firings (whole hot window by default), oldest first"""
+        if count is None or count >= len(self._window):
+            return list(self._window)
+        return list(self._window)[-count:] if count > 0 else []
+
+    def iter_spilled(self):
+        """Lazily page spilled firings back from disk, one segment at a time"""
+        for path, _ in list(self._segments):
+            with open(path, encoding='utf-8') as segment:
+                for line in segment:
+                    yield json.loads(line)
+
+    def iter_all(self):
+        """Every firing in logging order: spilled segments first, then the hot window"""
+        yield from self.iter_spilled()
+        yield from list(self._window)
+
+    def _evict(self):
+        overflow = len(self._window) - self.window_size
+        if overflow > 0:
+            self._spill([self._window.popleft() for _ in range(overflow)])
+
+    def _spill(self, firings):
+        """Append evicted firings to the segment store, rolling segments as they fill"""
+        start = 0
+        while start < len(firings):
+            if not self._segments or self._segments[-1][1] >= self.segment_size:
+                path = os.path.join(self.directory, f"segment-{len(self._segments):06d}.jsonl")
+                self._segments.append([path, 0])
+            segment = self._segments[-1]
+            batch = firings[start:start + self.segment_size - segment[1]]
+            with open(segment[0], 'a', encoding='utf-8') as out:
+                out.writelines(json.dumps(firing) + '\n' for firing in batch)
+            segment[1] += len(batch)
+            self._spilled += len(batch)
+            start += len(batch)
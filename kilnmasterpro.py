@@ -1,11 +1,18 @@
 import streamlit as st
 import json
+import os
 import pandas as pd
 from datetime import datetime, date
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import base64
+from analytics import get_health_status, summarize_firings
+from history_store import FiringHistory, HISTORY_WINDOW, RECENT_FIRINGS_SHOWN
+from telemetry import TelemetryHub, parse_controllers
+
+# Seconds between refreshes of the live telemetry panels
+TELEMETRY_REFRESH_SECONDS = 2
 
 # Page config
 st.set_page_config(
@@ -17,7 +24,8 @@ st.set_page_config(
 
 # Initialize session state
 if 'firings' not in st.session_state:
-    st.session_state.firings = []
+    # Only the newest HISTORY_WINDOW firings live in memory; older ones are spilled to disk
+    st.session_state.firings = FiringHistory(window_size=HISTORY_WINDOW)
 
 if 'zone_offsets' not in st.session_state:
     st.session_state.zone_offsets = {'top': 18, 'middle': 18, 'bottom': 18}
@@ -32,6 +40,10 @@ if 'hardware' not in st.session_state:
 if 'programs' not in st.session_state:
     st.session_state.programs = []
 
+if 'hardware_kiln' not in st.session_state:
+    # Controller whose live alerts count against the hardware records
+    st.session_state.hardware_kiln = None
+
 # Constants
 CONE_TEMPS = {
     '04': 1830, '03': 1850, '02': 1870, '01': 1890, '1': 1910,
@@ -47,10 +59,10 @@ CLAY_BODIES = [
 # Helper functions
 def calculate_suggested_offsets():
     """Calculate AI-suggested offsets based on recent firing history"""
-    if len(st.session_state.firings) == 0:
+    if not st.session_state.firings:
         return None
     
-    recent_firings = st.session_state.firings[-5:]  # Last 5 firings
+    recent_firings = st.session_state.firings.recent(5)  # Last 5 firings
     suggestions = {'top': 0, 'middle': 0, 'bottom': 0}
     
     for zone in ['top', 'middle', 'bottom']:
@@ -90,20 +102,64 @@ def calculate_suggested_offsets():
     
     return suggestions
 
-def get_health_status(component_data):
-    """Get health status for hardware components"""
-    usage = (component_data['firing_count'] / component_data['max_life']) * 100
-    if usage < 60:
-        return {'color': 'green', 'status': 'Excellent', 'emoji': '✅'}
-    elif usage < 85:
-        return {'color': 'orange', 'status': 'Monitor', 'emoji': '⚠️'}
-    else:
-        return {'color': 'red', 'status': 'Replace Soon', 'emoji': '🚨'}
+@st.cache_resource
+def get_telemetry_hub():
+    """Controller poller shared by every session, started once per server"""
+    controllers = parse_controllers(os.environ.get('KILNMASTER_CONTROLLERS', ''))
+    return TelemetryHub(controllers).start()
+
+def format_reading(value, unit='', digits=0):
+    return '—' if value is None else f"{value:.{digits}f}{unit}"
+
+@st.fragment(run_every=TELEMETRY_REFRESH_SECONDS)
+def show_live_telemetry(view):
+    """Live controller panel; reruns on its own timer without rerunning the page"""
+    for name, kiln in get_telemetry_hub().snapshot().items():
+        status = "🟢 Online" if kiln['online'] else f"🔴 Offline {kiln['error']}".strip()
+        st.write(f"**{name}** - {status}")
+        
+        for alert in kiln['alerts']:
+            st.error(f"🚨 {alert['message']} (since {alert['since']})")
+        
+        if not kiln['zones']:
+            continue
+        
+        if view == 'zones':
+            cols = st.columns(len(kiln['zones']) + 1)
+            for col, (zone, stats) in zip(cols, kiln['zones'].items()):
+                with col:
+                    lag = None if stats['lag'] is None else -stats['lag']
+                    st.metric(
+                        label=f"{zone.title()} Zone",
+                        value=format_reading(stats['temp'], '°F'),
+                        delta=None if lag is None else f"{lag:+.0f}°F vs setpoint"
+                    )
+            with cols[-1]:
+                st.metric(label="Zone Spread", value=format_reading(kiln['spread'], '°F'))
+        else:
+            rows = []
+            for zone, stats in kiln['zones'].items():
+                ttt = stats['time_to_temp']
+                rows.append({
+                    'Zone': zone.title(),
+                    'Temp': format_reading(stats['temp'], '°F'),
+                    'Programmed Ramp': format_reading(stats['programmed_ramp'], '°F/hr'),
+                    'Achieved Ramp': format_reading(stats['achieved_ramp'], '°F/hr'),
+                    'Ramp Achieved': '—' if stats['ramp_ratio'] is None else f"{stats['ramp_ratio']:.0%}",
+                    'Output': '—' if stats['output'] is None else f"{stats['output']:.0%}",
+                    'Time to Temp': '—' if ttt is None else f"{int(ttt // 3600)}h {int(ttt % 3600 // 60)}m"
+                })
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+            
+            if kiln['events']:
+                with st.expander(f"Alert history ({len(kiln['events'])})"):
+                    for event in reversed(kiln['events']):
+                        st.write(f"- {event['since']}: {event['message']}")
 
 def export_data():
     """Export all data as JSON"""
     data = {
-        'firings': st.session_state.firings,
+        'firings': list(st.session_state.firings),  # Pages in the full history from disk
         'zone_offsets': st.session_state.zone_offsets,
         'hardware': st.session_state.hardware,
         'programs': st.session_state.programs,
@@ -250,18 +306,20 @@ if page == "🔥 Firing Log":
         )
     
     with col4:
-        if st.session_state.firings:
-            success_count = sum(1 for f in st.session_state.firings 
+        window = st.session_state.firings.recent()
+        if window:
+            success_count = sum(1 for f in window 
                               if any(word in f.get('actual_result', '').lower() 
                                    for word in ['perfect', 'good']) or
                                  (f'cone {f.get("target_cone", "")}' in f.get('actual_result', '').lower() and 
                                   'hot' not in f.get('actual_result', '').lower()))
-            success_rate = round((success_count / len(st.session_state.firings)) * 100)
+            success_rate = round((success_count / len(window)) * 100)
         else:
             success_rate = 0
         st.metric(
             label="🎯 Success Rate",
-            value=f"{success_rate}%"
+            value=f"{success_rate}%",
+            help=f"Across your last {len(window)} firings. See Analytics for your full history."
         )
     
     # Smart suggestions
@@ -353,7 +411,7 @@ if page == "🔥 Firing Log":
     st.subheader("📋 Recent Firings")
     
     if st.session_state.firings:
-        for firing in reversed(st.session_state.firings[-10:]):  # Show last 10 firings
+        for firing in reversed(st.session_state.firings.recent(RECENT_FIRINGS_SHOWN)):
             with st.expander(f"{firing['date']} - {firing['firing_type'].title()} - Cone {firing['target_cone']}"):
                 col1, col2 = st.columns(2)
                 
@@ -414,11 +472,16 @@ elif page == "🎯 Zone Control":
                 st.session_state.zone_offsets[zone] = new_offset
                 st.success(f"✅ {zone.title()} zone updated!")
     
+    # Live zone readings
+    if get_telemetry_hub().controllers:
+        st.subheader("📡 Live Zone Readings")
+        show_live_telemetry('zones')
+    
     # Zone performance chart
     if st.session_state.firings:
         st.subheader("📊 Recent Zone Performance")
         
-        recent_firings = st.session_state.firings[-5:]
+        recent_firings = st.session_state.firings.recent(5)
         
         data = []
         for firing in recent_firings:
@@ -518,13 +581,37 @@ elif page == "🔧 Maintenance":
     st.header("🔧 Hardware Maintenance")
     st.write("Monitor and maintain your kiln components")
     
+    # Live controller telemetry
+    st.subheader("📡 Live Controller Telemetry")
+    hub = get_telemetry_hub()
+    if hub.controllers:
+        show_live_telemetry('maintenance')
+    else:
+        st.info("📡 No kiln controllers connected. Set KILNMASTER_CONTROLLERS (e.g. 'Big Kiln=tcp://192.168.1.20:9100') to stream live readings.")
+    
+    st.divider()
+    
     # Hardware status cards
     components = ['elements', 'thermocouples', 'relays']
     component_names = ['Elements', 'Thermocouples', 'Relays']
+    alert_kinds = {'elements': 'element', 'relays': 'relay'}
+    
+    # The hardware records describe one kiln, so only its controller's alerts count against them
+    kiln_names = list(hub.controllers)
+    if kiln_names:
+        current = st.session_state.hardware_kiln
+        st.session_state.hardware_kiln = st.selectbox(
+            "Kiln these components belong to",
+            kiln_names,
+            index=kiln_names.index(current) if current in kiln_names else 0,
+            help="Live alerts from this kiln's controller raise the health status below. Alerts from other kilns are only shown above."
+        )
+    live_alerts = [a for a in hub.alerts() if a['kiln'] == st.session_state.hardware_kiln]
     
     for i, component in enumerate(components):
         data = st.session_state.hardware[component]
-        health = get_health_status(data)
+        component_alerts = [a for a in live_alerts if a['kind'] == alert_kinds.get(component)]
+        health = get_health_status(data, component_alerts)
         usage_percent = round((data['firing_count'] / data['max_life']) * 100)
         
         st.subheader(f"{health['emoji']} {component_names[i]}")
@@ -562,11 +649,14 @@ elif page == "🔧 Maintenance":
         st.write(f"**Usage:** {usage_percent}% - {health['status']}")
         st.progress(min(usage_percent / 100, 1.0))
         
+        for alert in component_alerts:
+            st.error(f"📡 {alert['kiln']}: {alert['message']}")
+        
         if usage_percent >= 85:
             st.error(f"🚨 {component_names[i]} replacement recommended soon! ({usage_percent}% used)")
         elif usage_percent >= 60:
             st.warning(f"⚠️ Monitor {component_names[i]} closely. ({usage_percent}% used)")
-        else:
+        elif not component_alerts:
             st.success(f"✅ {component_names[i]} in excellent condition. ({usage_percent}% used)")
         
         st.divider()
@@ -580,25 +670,22 @@ elif page == "📊 Analytics":
     else:
         firings = st.session_state.firings
         
+        # Single lazy pass over the full history, spilled segments included
+        summary = summarize_firings(firings)
+        clay_counts = summary['clay_counts']
+        type_counts = summary['type_counts']
+        
         # Key metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            success_count = sum(1 for f in firings 
-                              if any(word in f.get('actual_result', '').lower() 
-                                   for word in ['perfect', 'good']))
-            success_rate = round((success_count / len(firings)) * 100)
-            st.metric("🎯 Success Rate", f"{success_rate}%")
+            st.metric("🎯 Success Rate", f"{round(summary['success_rate'])}%")
         
         with col2:
-            avg_offset = round(sum(f['zone_offsets']['middle'] for f in firings) / len(firings))
+            avg_offset = round(summary['avg_offsets']['middle'])
             st.metric("🌡️ Avg Middle Offset", f"{avg_offset}°F")
         
         with col3:
-            clay_counts = {}
-            for f in firings:
-                if f.get('clay_body'):
-                    clay_counts[f['clay_body']] = clay_counts.get(f['clay_body'], 0) + 1
             top_clay = max(clay_counts.keys(), key=lambda k: clay_counts[k]) if clay_counts else "None"
             st.metric("🏺 Top Clay Body", top_clay.split()[0] if top_clay != "None" else "None")
         
@@ -611,7 +698,7 @@ elif page == "📊 Analytics":
         with col1:
             # Zone offset trends
             if len(firings) > 1:
-                recent_firings = firings[-10:]
+                recent_firings = firings.recent(10)
                 
                 data = []
                 for firing in recent_firings:
@@ -632,11 +719,6 @@ elif page == "📊 Analytics":
         
         with col2:
             # Firing type distribution
-            type_counts = {}
-            for f in firings:
-                ftype = f.get('firing_type', 'unknown')
-                type_counts[ftype] = type_counts.get(ftype, 0) + 1
-            
             if type_counts:
                 fig = px.pie(values=list(type_counts.values()), 
                            names=list(type_counts.keys()),
@@ -0,0 +1,409 @@
+"""Concurrent-session load harness for KilnMaster Pro.
+
+Starts one real ``streamlit run`` server per concurrency level and points
+N websocket clients at it, each speaking the same protocol as a browser
+tab. Every session therefore shares the server's script threads, GIL and
+``st.cache_resource`` objects the way studio users do. Each session
+is pre-seeded with a large synthetic firing history by the server's entry
+point (``serve_seeded_session``) and then replays a realistic click
+script: moving between pages, logging firings, applying offset
+suggestions and opening Analytics.
+
+For every session count the harness reports rerun latency percentiles,
+rerun throughput and the server's resident memory per session, e.g.::
+
+    python loadtest.py --sessions 1 5 10 25 --history 5000 --steps 40
+
+The clients run in this process on the same machine as the server. They
+only send widget events and decode replies, but on a small box they still
+take some CPU from the server under test.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+import urllib.request
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from history_store import FiringHistory, HISTORY_WINDOW
+
+REPO_DIR = Path(__file__).resolve().parent
+APP_PATH = str(REPO_DIR / "kilnmasterpro.py")
+
+# Script the server runs: seed the session, then hand over to the app
+SERVER_SCRIPT = """\
+import sys
+sys.path.insert(0, {repo!r})
+import loadtest
+loadtest.serve_seeded_session()
+"""
+
+NAV_PAGES = [
+    "🔥 Firing Log", "🎯 Zone Control", "⚙️ Programs", "🔧 Maintenance",
+    "📊 Analytics", "❓ Help", "ℹ️ About"
+]
+
+ZONES = ['top', 'middle', 'bottom']
+
+SAMPLE_RESULTS = [
+    'perfect cone 6', 'good cone 6', 'hot cone 6', 'soft cone 6',
+    'cone 7', 'cone 5', 'cone 6', 'cone 8'
+]
+
+SAMPLE_CLAY_BODIES = [
+    'Cone 6 Stoneware', 'Porcelain', 'Buff Stoneware', 'White Stoneware',
+    'Speckled Stoneware', 'Dark Stoneware', 'Earthenware', 'Custom Mix', ''
+]
+
+# Seconds the server may take to come up, and a session to open its first page
+SERVER_START_TIMEOUT = 60
+SETUP_TIMEOUT = 120
+
+# Relative weights of the actions in a simulated click script
+ACTION_WEIGHTS = {
+    'navigate': 5,
+    'log_firing': 2,
+    'apply_suggestion': 1,
+    'analytics': 2,
+}
+
+
+def synthetic_firings(count, rng):
+    """Build a firing history shaped like the one the Firing Log writes"""
+    start = datetime.now() - timedelta(days=count)
+    firings = []
+    for i in range(count):
+        fired_at = start + timedelta(days=i, hours=rng.randint(6, 20))
+        offset = rng.randint(10, 40)
+        firings.append({
+            'id': i + 1,
+            'date': fired_at.strftime("%Y-%m-%d"),
+            'time': fired_at.strftime("%H:%M:%S"),
+            'zone_offsets': {zone: offset + rng.randint(-5, 5) for zone in ZONES},
+            'target_cone': '6',
+            'actual_result': rng.choice(SAMPLE_RESULTS),
+            'zone_results': {
+                zone: rng.choice(SAMPLE_RESULTS) if rng.random() < 0.3 else ''
+                for zone in ZONES
+            },
+            'firing_type': rng.choice(['bisque', 'glaze', 'glaze', 'test']),
+            'clay_body': rng.choice(SAMPLE_CLAY_BODIES),
+            'glaze_type': rng.choice(['', 'Clear', 'Celadon', 'Matte Black']),
+            'load_density': rng.choice(['full', 'partial', 'test']),
+            'notes': '',
+            'timestamp': fired_at.isoformat()
+        })
+    return firings
+
+
+def resident_memory(pid='self'):
+    """Current resident set size of a process in bytes, or None without procfs"""
+    try:
+        with open(f'/proc/{pid}/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        # ru_maxrss is a peak that never falls, so it can't measure a session
+        return None
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+_APP_CODE = None
+
+
+def serve_seeded_session():
+    """Server-side entry point: give a new session its synthetic history, then run the app"""
+    global _APP_CODE
+    import streamlit as st
+
+    if 'firings' not in st.session_state:
+        firings = FiringHistory(window_size=HISTORY_WINDOW)
+        firings.extend(synthetic_firings(
+            int(os.environ['KILNMASTER_LOADTEST_HISTORY']),
+            random.Random(int(os.environ['KILNMASTER_LOADTEST_SEED']))
+        ))
+        st.session_state.firings = firings
+    if _APP_CODE is None:
+        _APP_CODE = compile(Path(APP_PATH).read_text(encoding='utf-8'), APP_PATH, 'exec')
+    exec(_APP_CODE, {'__name__': '__main__', '__file__': APP_PATH})
+
+
+class SimulatedSession:
+    """One studio user clicking through the app over its own websocket"""
+
+    def __init__(self, url, origin, rng, timeout):
+        self.url = url
+        self.origin = origin
+        self.rng = rng
+        self.timeout = timeout
+        self.latencies = []
+        self.errors = 0
+        self.page = "🔥 Firing Log"
+        self.widgets = {}  # label or key -> widget proto from the last run
+        self.values = {}  # widget id -> WidgetState the browser would resend
+        self.ws = None
+
+    async def open(self):
+        """Connect and load the first page, untimed"""
+        self.ws = await websockets.connect(
+            self.url, subprotocols=['streamlit'], origin=self.origin, max_size=None
+        )
+        await asyncio.wait_for(self._run_script(), self.timeout)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def _run_script(self, trigger=None):
+        """Send one rerun request and read replies until the script finishes"""
+        request = BackMsg()
+        request.rerun_script.SetInParent()
+        states = request.rerun_script.widget_states.widgets
+        for state in self.values.values():
+            states.add().CopyFrom(state)
+        if trigger is not None:
+            states.add(id=trigger, trigger_value=True)
+        await self.ws.send(request.SerializeToString())
+
+        widgets = {}
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(await self.ws.recv())
+            kind = reply.WhichOneof('type')
+            if kind == 'delta' and reply.delta.WhichOneof('type') == 'new_element':
+                element = reply.delta.new_element
+                widget = getattr(element, element.WhichOneof('type'))
+                if element.WhichOneof('type') == 'exception':
+                    self.errors += 1
+                elif getattr(widget, 'id', ''):
+                    # User keys end the widget id; anything else goes by label
+                    key = widget.id.rsplit('-', 1)[-1]
+                    widgets[getattr(widget, 'label', '') if key == 'None' else key] = widget
+            elif kind == 'script_finished':
+                status = reply.script_finished
+                if status == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors += 1
+                if status != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    break
+        self.widgets = widgets
+
+    async def _rerun(self, trigger=None):
+        """Time a single script rerun, optionally triggered by a button"""
+        started = time.perf_counter()
+        await asyncio.wait_for(self._run_script(trigger), self.timeout)
+        self.latencies.append(time.perf_counter() - started)
+
+    def _find(self, name):
+        widget = self.widgets.get(name)
+        if widget is None:
+            raise LookupError(f"no widget {name!r} on the page")
+        return widget
+
+    def _set(self, name, value):
+        widget_id = self._find(name).id
+        self.values[widget_id] = WidgetState(id=widget_id, string_value=value)
+
+    async def navigate(self, page=None):
+        page = page or self.rng.choice(NAV_PAGES)
+        await self._rerun(self._find(f"nav_{page}").id)
+        self.page = page
+
+    async def log_firing(self):
+        if self.page != "🔥 Firing Log":
+            await self.navigate("🔥 Firing Log")
+        self._set("Overall Result", self.rng.choice(SAMPLE_RESULTS))
+        self._set("Middle Zone Result", self.rng.choice(SAMPLE_RESULTS))
+        self._set("Clay Body", self.rng.choice([c for c in SAMPLE_CLAY_BODIES if c]))
+        await self._rerun(self._find("🔥 Log Firing").id)
+
+    async def apply_suggestion(self):
+        if self.page != "🔥 Firing Log":
+            await self.navigate("🔥 Firing Log")
+        available = [w.id for name, w in self.widgets.items() if name.startswith("apply_")]
+        await self._rerun(self.rng.choice(available) if available else None)
+
+    async def analytics(self):
+        await self.navigate("📊 Analytics")
+
+    async def play(self, steps):
+        """Run the click script, counting any action that blows up as an error"""
+        actions = list(ACTION_WEIGHTS)
+        weights = list(ACTION_WEIGHTS.values())
+        for _ in range(steps):
+            action = self.rng.choices(actions, weights)[0]
+            try:
+                await getattr(self, action)()
+            except (asyncio.TimeoutError, websockets.ConnectionClosed):
+                # Replies from the lost rerun would be read as the next one's
+                self.errors += 1
+                return
+            except Exception:
+                self.errors += 1
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def start_server(workdir, history_size, seed):
+    """Launch ``streamlit run`` on the seeded entry point and wait until it answers"""
+    script = Path(workdir) / "loadtest_app.py"
+    script.write_text(SERVER_SCRIPT.format(repo=str(REPO_DIR)), encoding='utf-8')
+    port = free_port()
+    env = dict(os.environ, KILNMASTER_LOADTEST_HISTORY=str(history_size),
+               KILNMASTER_LOADTEST_SEED=str(seed))
+    # No controllers: live telemetry polling would only add noise
+    env.pop('KILNMASTER_CONTROLLERS', None)
+    log = open(Path(workdir) / "server.log", 'wb')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', str(script),
+         '--server.headless', 'true', '--server.address', '127.0.0.1', '--server.port', str(port),
+         '--server.enableXsrfProtection', 'false', '--server.fileWatcherType', 'none',
+         '--browser.gatherUsageStats', 'false'],
+        cwd=REPO_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    log.close()
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline and server.poll() is None:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return server, port
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    server.wait()
+    raise RuntimeError(
+        "streamlit server did not start:\n"
+        + (Path(workdir) / "server.log").read_text(encoding='utf-8', errors='replace')[-2000:]
+    )
+
+
+async def _drive_level(port, server_pid, sessions, history_size, steps, timeout, seed):
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    origin = f"http://127.0.0.1:{port}"
+    setup_timeout = max(SETUP_TIMEOUT, timeout * 2) + history_size / 1000
+
+    # One session first, so the baseline already holds the app's imports and caches
+    warmup = SimulatedSession(url, origin, random.Random(seed), setup_timeout)
+    await warmup.open()
+    baseline_rss = resident_memory(server_pid)
+
+    players = [SimulatedSession(url, origin, random.Random(seed + i), setup_timeout) for i in range(sessions)]
+    opened = await asyncio.gather(*(p.open() for p in players), return_exceptions=True)
+    failures = [o for o in opened if isinstance(o, BaseException)]
+    for failure in failures[:1]:
+        print("  session failed to start:\n" + "".join(traceback.format_exception(failure)), flush=True)
+    ready = [p for p, o in zip(players, opened) if not isinstance(o, BaseException)]
+    for player in ready:
+        player.timeout = timeout
+
+    # Every ready session starts clicking at once
+    started = time.perf_counter()
+    await asyncio.gather(*(p.play(steps) for p in ready))
+    elapsed = time.perf_counter() - started
+    loaded_rss = resident_memory(server_pid)
+
+    await asyncio.gather(*(p.close() for p in players + [warmup]), return_exceptions=True)
+
+    latencies = sorted(l for p in ready for l in p.latencies)
+    rss_per_session = None
+    if baseline_rss is not None and loaded_rss is not None and ready:
+        rss_per_session = max(0, loaded_rss - baseline_rss) / len(ready) / 2**20
+    return {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        # Sessions that never opened count as one error each
+        'errors': sum(p.errors for p in ready) + len(failures),
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'reruns_per_s': len(latencies) / elapsed if elapsed else 0.0,
+        'rss_per_session_mb': rss_per_session,
+    }
+
+
+def run_level(sessions, history_size, steps, timeout, seed):
+    """Run one concurrency level against a fresh server and return its summary row"""
+    with tempfile.TemporaryDirectory(prefix='kilnmaster-loadtest-') as workdir:
+        server, port = start_server(workdir, history_size, seed)
+        try:
+            return asyncio.run(_drive_level(port, server.pid, sessions, history_size, steps, timeout, seed))
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+
+
+def format_memory(megabytes):
+    return 'n/a' if megabytes is None else f"{megabytes:.2f}"
+
+
+def print_table(rows):
+    header = f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'reruns/s':>9} {'MB/session':>11}"
+    print(header)
+    print('-' * len(header))
+    for row in rows:
+        print(
+            f"{row['sessions']:>8} {row['reruns']:>7} {row['errors']:>6} "
+            f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} "
+            f"{row['reruns_per_s']:>9.1f} {format_memory(row['rss_per_session_mb']):>11}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test KilnMaster Pro with concurrent simulated sessions")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10, 25],
+                        help="session counts to test, one level each (default: 1 5 10 25)")
+    parser.add_argument('--history', type=int, default=5000,
+                        help="synthetic firings pre-seeded into every session (default: 5000)")
+    parser.add_argument('--steps', type=int, default=40,
+                        help="clicks per session at each level (default: 40)")
+    parser.add_argument('--timeout', type=float, default=60,
+                        help="seconds a single rerun may take before failing (default: 60)")
+    parser.add_argument('--seed', type=int, default=6,
+                        help="random seed for histories and click scripts (default: 6)")
+    parser.add_argument('--json', metavar='PATH',
+                        help="also write the results as JSON to PATH")
+    args = parser.parse_args()
+
+    rows = []
+    for sessions in args.sessions:
+        rows.append(run_level(sessions, args.history, args.steps, args.timeout, args.seed))
+        print(f"  finished {sessions} session(s)", flush=True)
+
+    print()
+    print_table(rows)
+
+    if args.json:
+        with open(args.json, 'w') as out:
+            json.dump({'history': args.history, 'steps': args.steps, 'levels': rows}, out, indent=2)
+
+
+if __name__ == "__main__":
+    main()
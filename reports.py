@@ -0,0 +1,430 @@
+"""Batch firing reports for KilnMaster Pro.
+
+Turns "📥 Export Data" files, one per kiln, into static HTML (and
+optionally PDF) summaries: one report per kiln and one per clay body,
+plus an index page. Every report shows success rate, offset history,
+hardware wear and charts::
+
+    python reports.py exports/*.json --month 2026-09 --out reports/ --pdf
+
+All exports are loaded and aggregated once in the parent process. The
+studio-wide totals, per-clay-body baselines and per-kiln breakdowns are
+handed to each worker a single time, when the worker starts. Workers in a
+process pool then only draw charts and render pages.
+
+Charts are embedded as PNG images when plotly can export them (the
+optional kaleido package with Chrome installed; ``--fetch-chrome`` downloads
+Chrome for it). Otherwise reports draw interactive charts from a single
+``plotly.min.js`` written next to them, so pages still work offline without
+every report carrying its own multi-megabyte copy. PDF output needs
+weasyprint and PNG charts.
+"""
+
+import argparse
+import base64
+import html
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from analytics import ZONES, get_health_status, summarize_firings
+
+COMPONENT_NAMES = {'elements': 'Elements', 'thermocouples': 'Thermocouples', 'relays': 'Relays'}
+CHART_SIZE = {'width': 760, 'height': 360}
+PLOTLYJS_FILE = 'plotly.min.js'  # shared by every report with interactive charts
+
+REPORT_CSS = """
+body { font-family: -apple-system, 'Segoe UI', Roboto, sans-serif; color: #1f2937; margin: 2rem auto; max-width: 860px; }
+.header { background: linear-gradient(90deg, #f97316, #dc2626); color: white; padding: 1.5rem 2rem; border-radius: 1rem; }
+.header h1 { margin: 0 0 0.25rem 0; }
+.metrics { display: flex; gap: 1rem; margin: 1.5rem 0; }
+.metric { flex: 1; border-left: 4px solid #f97316; background: #f8fafc; padding: 0.75rem 1rem; border-radius: 0.5rem; }
+.metric .value { font-size: 1.6rem; font-weight: bold; }
+.metric .label { color: #64748b; font-size: 0.85rem; }
+table { width: 100%; border-collapse: collapse; margin: 0.5rem 0 1.5rem 0; }
+th, td { text-align: left; padding: 0.4rem 0.6rem; border-bottom: 1px solid #e2e8f0; }
+th { background: #f1f5f9; }
+.green { color: #059669; } .orange { color: #d97706; } .red { color: #dc2626; }
+img.chart { width: 100%; max-width: 760px; }
+footer { color: gray; text-align: center; margin-top: 2rem; font-size: 0.85rem; }
+"""
+
+# Shared aggregates, installed once per worker process
+_shared = None
+_images = True
+
+
+class ReportConflict(ValueError):
+    """Two inputs would end up as the same report"""
+
+
+def slugify(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'report'
+
+
+def report_stem(kind, name):
+    return f"{kind}-{slugify(name)}"
+
+
+def load_exports(paths, month=None):
+    """Read app exports into {kiln name: export}, keeping only firings from ``month``.
+
+    Raises ReportConflict when two exports resolve to the same kiln name,
+    rather than letting one silently replace the other.
+    """
+    kilns = {}
+    sources = {}
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        name = data.get('kiln') or Path(path).stem
+        if name in sources:
+            raise ReportConflict(
+                f"{sources[name]} and {path} are both kiln {name!r}; "
+                "add a 'kiln' key to one export or rename the file"
+            )
+        sources[name] = path
+        firings = data.get('firings', [])
+        if month:
+            firings = [firing for firing in firings if firing.get('date', '').startswith(month)]
+        kilns[name] = {
+            'firings': firings,
+            'hardware': data.get('hardware', {}),
+            'zone_offsets': data.get('zone_offsets', {})
+        }
+    return kilns
+
+
+def build_aggregates(kilns, month=None):
+    """Everything the reports share, computed once for the whole run"""
+    by_clay = {}
+    for name, kiln in kilns.items():
+        for firing in kiln['firings']:
+            clay = firing.get('clay_body') or 'Unspecified'
+            by_clay.setdefault(clay, {}).setdefault(name, []).append(firing)
+
+    # Summarized once per (clay, kiln); kiln reports point at the same dicts,
+    # so pickling the aggregates for the workers doesn't copy them either
+    clay_by_kiln = {
+        clay: {name: summarize_firings(firings) for name, firings in per_kiln.items()}
+        for clay, per_kiln in by_clay.items()
+    }
+
+    kiln_aggregates = {}
+    for name, kiln in kilns.items():
+        firings = sorted(kiln['firings'], key=lambda f: f.get('timestamp', f.get('date', '')))
+        hardware = {}
+        for component, data in kiln['hardware'].items():
+            hardware[component] = dict(
+                data,
+                usage=round((data['firing_count'] / data['max_life']) * 100),
+                health=get_health_status(data)
+            )
+        kiln_aggregates[name] = {
+            'summary': summarize_firings(firings),
+            'clay_summaries': {
+                clay: per_kiln[name] for clay, per_kiln in clay_by_kiln.items() if name in per_kiln
+            },
+            'offset_history': [
+                {'Date': f['date'], 'Zone': zone.title(), 'Offset': f['zone_offsets'][zone]}
+                for f in firings for zone in ZONES
+            ],
+            'hardware': hardware,
+            'zone_offsets': kiln['zone_offsets']
+        }
+
+    return {
+        'month': month,
+        'generated': datetime.now().strftime("%Y-%m-%d %H:%M"),
+        'studio': summarize_firings(f for kiln in kilns.values() for f in kiln['firings']),
+        'clay_studio': {
+            clay: summarize_firings(f for firings in per_kiln.values() for f in firings)
+            for clay, per_kiln in by_clay.items()
+        },
+        'clay_by_kiln': clay_by_kiln,
+        'kilns': kiln_aggregates
+    }
+
+
+def can_export_images():
+    """Check once, before starting workers, that plotly can write PNGs here"""
+    try:
+        pio.to_image(go.Figure(), format='png', width=10, height=10)
+    except (ImportError, RuntimeError, ValueError):
+        return False
+    return True
+
+
+def _init_worker(shared, images):
+    """Install the shared aggregates and warm up chart export for this worker"""
+    global _shared, _images
+    _shared = shared
+    _images = images
+    if _images:
+        import kaleido
+        # One long-lived browser per worker instead of one per chart (kaleido >= 1.1)
+        if hasattr(kaleido, 'start_sync_server'):
+            kaleido.start_sync_server(silence_warnings=True)
+
+
+class ChartRenderer:
+    """Embeds figures as PNG images, falling back to the shared plotly.js"""
+
+    def __init__(self):
+        self.fell_back = False
+        self._plotlyjs_included = False
+
+    def __call__(self, fig):
+        global _images
+        fig.update_layout(template='plotly_white', margin={'l': 40, 'r': 20, 't': 50, 'b': 40}, **CHART_SIZE)
+        if _images:
+            try:
+                png = pio.to_image(fig, format='png', scale=2)
+                return f'<img class="chart" src="data:image/png;base64,{base64.b64encode(png).decode()}">'
+            except (ImportError, RuntimeError, ValueError):
+                _images = False
+        self.fell_back = True
+        # Link the library once per report; generate_reports writes the file
+        include = 'directory' if not self._plotlyjs_included else False
+        self._plotlyjs_included = True
+        return fig.to_html(full_html=False, include_plotlyjs=include)
+
+
+def _metric(label, value):
+    return f'<div class="metric"><div class="value">{html.escape(str(value))}</div><div class="label">{html.escape(label)}</div></div>'
+
+
+def _table(headers, rows):
+    head = ''.join(f'<th>{html.escape(h)}</th>' for h in headers)
+    body = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>' for row in rows)
+    return f'<table><tr>{head}</tr>{body}</table>'
+
+
+def _page(shared, title, subtitle, body):
+    period = shared['month'] or 'All firings'
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)}</title><style>{REPORT_CSS}</style></head>
+<body>
+<div class="header"><h1>🔥 {html.escape(title)}</h1><div>{html.escape(subtitle)} · {html.escape(period)}</div></div>
+{body}
+<footer>Generated {shared['generated']} by KilnMaster Pro</footer>
+</body></html>
+"""
+
+
+def render_kiln_report(name):
+    kiln = _shared['kilns'][name]
+    summary = kiln['summary']
+    studio = _shared['studio']
+    chart = ChartRenderer()
+    parts = []
+
+    offsets = kiln['zone_offsets']
+    parts.append('<div class="metrics">' + ''.join([
+        _metric("Firings", summary['total']),
+        _metric("Success Rate", f"{round(summary['success_rate'])}%"),
+        _metric("Studio Success Rate", f"{round(studio['success_rate'])}%"),
+        _metric("Current Offsets", f"T:{offsets.get('top', '—')}° M:{offsets.get('middle', '—')}° B:{offsets.get('bottom', '—')}°"),
+    ]) + '</div>')
+
+    parts.append('<h2>🎯 Offset History</h2>')
+    if kiln['offset_history']:
+        fig = px.line(kiln['offset_history'], x='Date', y='Offset', color='Zone', markers=True,
+                      title="Zone Offsets by Firing")
+        parts.append(chart(fig))
+    else:
+        parts.append('<p>No firings logged in this period.</p>')
+
+    parts.append('<h2>🏺 Clay Bodies</h2>')
+    clay_rows = []
+    for clay, clay_summary in sorted(kiln['clay_summaries'].items()):
+        baseline = _shared['clay_studio'][clay]
+        clay_rows.append([
+            html.escape(clay), clay_summary['total'],
+            f"{round(clay_summary['success_rate'])}%", f"{round(baseline['success_rate'])}%",
+            f"{round(clay_summary['avg_offsets']['middle'])}°F"
+        ])
+    if clay_rows:
+        parts.append(_table(['Clay Body', 'Firings', 'Success Rate', 'Studio Rate', 'Avg Middle Offset'], clay_rows))
+        clays = sorted(kiln['clay_summaries'])
+        fig = go.Figure([
+            go.Bar(name=name, x=clays, y=[kiln['clay_summaries'][c]['success_rate'] for c in clays]),
+            go.Bar(name='Studio', x=clays, y=[_shared['clay_studio'][c]['success_rate'] for c in clays])
+        ])
+        fig.update_layout(barmode='group', title="Success Rate by Clay Body (%)", yaxis_range=[0, 100])
+        parts.append(chart(fig))
+
+    parts.append('<h2>🔧 Hardware Wear</h2>')
+    if kiln['hardware']:
+        rows = [
+            [COMPONENT_NAMES.get(component, component.title()), html.escape(data.get('installed') or '—'),
+             f"{data['firing_count']}/{data['max_life']}", f"{data['usage']}%",
+             f'<span class="{data["health"]["color"]}">{data["health"]["emoji"]} {data["health"]["status"]}</span>']
+            for component, data in kiln['hardware'].items()
+        ]
+        parts.append(_table(['Component', 'Installed', 'Firings', 'Usage', 'Status'], rows))
+        components = list(kiln['hardware'])
+        fig = go.Figure(go.Bar(
+            x=[COMPONENT_NAMES.get(c, c.title()) for c in components],
+            y=[kiln['hardware'][c]['usage'] for c in components],
+            marker_color=[kiln['hardware'][c]['health']['color'] for c in components]
+        ))
+        fig.update_layout(title="Component Life Used (%)")
+        parts.append(chart(fig))
+    else:
+        parts.append('<p>No hardware records in this export.</p>')
+
+    if summary['type_counts']:
+        fig = px.pie(values=list(summary['type_counts'].values()), names=list(summary['type_counts'].keys()),
+                     title="Firing Type Distribution")
+        parts.append('<h2>📊 Firing Types</h2>' + chart(fig))
+
+    return _page(_shared, name, "Kiln Firing Summary", '\n'.join(parts)), chart.fell_back
+
+
+def render_clay_report(clay):
+    per_kiln = _shared['clay_by_kiln'][clay]
+    summary = _shared['clay_studio'][clay]
+    chart = ChartRenderer()
+    parts = ['<div class="metrics">' + ''.join([
+        _metric("Firings", summary['total']),
+        _metric("Success Rate", f"{round(summary['success_rate'])}%"),
+        _metric("Kilns", len(per_kiln)),
+        _metric("Avg Middle Offset", f"{round(summary['avg_offsets']['middle'])}°F"),
+    ]) + '</div>']
+
+    kilns = sorted(per_kiln)
+    parts.append('<h2>🔥 By Kiln</h2>')
+    parts.append(_table(
+        ['Kiln', 'Firings', 'Success Rate', 'Avg Offsets (T/M/B)'],
+        [[html.escape(k), per_kiln[k]['total'], f"{round(per_kiln[k]['success_rate'])}%",
+          '/'.join(f"{round(per_kiln[k]['avg_offsets'][zone])}°" for zone in ZONES)] for k in kilns]
+    ))
+    fig = go.Figure(go.Bar(x=kilns, y=[per_kiln[k]['success_rate'] for k in kilns], marker_color='#f97316'))
+    fig.add_hline(y=summary['success_rate'], line_dash='dash', annotation_text='All kilns')
+    fig.update_layout(title=f"{clay} Success Rate by Kiln (%)", yaxis_range=[0, 100])
+    parts.append(chart(fig))
+
+    return _page(_shared, clay, "Clay Body Firing Summary", '\n'.join(parts)), chart.fell_back
+
+
+def _render_job(kind, name, out_dir, pdf):
+    """Worker entry point: render one report and write it out"""
+    document, fell_back = render_kiln_report(name) if kind == 'kiln' else render_clay_report(name)
+    stem = Path(out_dir) / report_stem(kind, name)
+    html_path = stem.with_suffix('.html')
+    html_path.write_text(document, encoding='utf-8')
+    if pdf:
+        from weasyprint import HTML
+        HTML(string=document, base_url=str(out_dir)).write_pdf(str(stem.with_suffix('.pdf')))
+    return kind, name, html_path.name, fell_back
+
+
+def write_index(out_dir, shared, written):
+    rows = [
+        [('Kiln' if kind == 'kiln' else 'Clay Body'), f'<a href="{filename}">{html.escape(name)}</a>']
+        for kind, name, filename in sorted(written)
+    ]
+    body = (
+        '<div class="metrics">'
+        + _metric("Kilns", len(shared['kilns']))
+        + _metric("Firings", shared['studio']['total'])
+        + _metric("Studio Success Rate", f"{round(shared['studio']['success_rate'])}%")
+        + '</div>'
+        + _table(['Report', 'Name'], rows)
+    )
+    (Path(out_dir) / 'index.html').write_text(_page(shared, "Monthly Firing Reports", "Studio Overview", body), encoding='utf-8')
+
+
+def generate_reports(paths, out_dir, month=None, workers=None, pdf=False, images=True):
+    """Render every kiln and clay body report; returns (written, fell_back)"""
+    shared = build_aggregates(load_exports(paths, month), month)
+    jobs = [('kiln', name) for name in shared['kilns']] + [('clay', clay) for clay in shared['clay_studio']]
+
+    # "Kiln A" and "kiln-a" would write the same file
+    stems = {}
+    for kind, name in jobs:
+        other = stems.setdefault(report_stem(kind, name), name)
+        if other != name:
+            raise ReportConflict(f"{other!r} and {name!r} would both be written to {report_stem(kind, name)}.html")
+    os.makedirs(out_dir, exist_ok=True)
+
+    images = images and can_export_images()
+    written = []
+    fell_back = False
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared, images)) as pool:
+        futures = [pool.submit(_render_job, kind, name, out_dir, pdf) for kind, name in jobs]
+        for future in as_completed(futures):
+            kind, name, filename, chart_fell_back = future.result()
+            written.append((kind, name, filename))
+            fell_back = fell_back or chart_fell_back
+
+    if fell_back:
+        # One local copy for all reports, so they open offline
+        (Path(out_dir) / PLOTLYJS_FILE).write_text(get_plotlyjs(), encoding='utf-8')
+    write_index(out_dir, shared, written)
+    return written, fell_back
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate KilnMaster Pro firing reports from exported kiln data")
+    parser.add_argument('exports', nargs='+', help="'Export Data' JSON files, one per kiln")
+    parser.add_argument('--month', help="only include firings from this month, e.g. 2026-09")
+    parser.add_argument('--out', default='reports', help="output directory (default: reports)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--pdf', action='store_true', help="also write PDFs (needs weasyprint and kaleido)")
+    parser.add_argument('--interactive-charts', action='store_true',
+                        help="draw plotly.js charts instead of embedding PNG images")
+    parser.add_argument('--fetch-chrome', action='store_true',
+                        help="download the Chrome that kaleido needs for PNG charts before rendering")
+    args = parser.parse_args()
+
+    if args.month and not re.fullmatch(r'\d{4}-\d{2}', args.month):
+        parser.error("--month must look like YYYY-MM")
+    if args.pdf:
+        if args.interactive_charts:
+            parser.error("--pdf needs PNG charts; drop --interactive-charts")
+        try:
+            import weasyprint  # noqa: F401
+        except ImportError:
+            parser.error("--pdf needs weasyprint: pip install weasyprint")
+    if args.fetch_chrome:
+        try:
+            import kaleido
+        except ImportError:
+            parser.error("--fetch-chrome needs kaleido: pip install kaleido")
+        try:
+            kaleido.get_chrome_sync()
+        except OSError as exc:
+            parser.error(f"could not download Chrome: {exc}")
+
+    started = time.perf_counter()
+    try:
+        written, fell_back = generate_reports(
+            args.exports, args.out, month=args.month, workers=args.workers,
+            pdf=args.pdf, images=not args.interactive_charts
+        )
+    except ReportConflict as exc:
+        parser.error(str(exc))
+    elapsed = time.perf_counter() - started
+
+    if fell_back and not args.interactive_charts:
+        print("⚠️ Could not export PNG charts (is kaleido installed with Chrome? try --fetch-chrome); "
+              "drew interactive charts instead.", file=sys.stderr)
+        if args.pdf:
+            print("⚠️ PDF reports were written without charts.", file=sys.stderr)
+    print(f"✅ Wrote {len(written)} reports to {args.out}/ in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,710 @@
+"""Live kiln controller telemetry for KilnMaster Pro.
+
+A ``TelemetryHub`` polls every configured controller from one asyncio loop
+running on a background thread, so the Streamlit script thread never waits
+on the network. Each poll updates O(1) rolling statistics per zone
+(achieved vs. programmed ramp rate, lag behind setpoint, time-to-temperature)
+and per kiln (zone spread), and raises alerts as soon as elements or relays
+start to misbehave. Pages read a cheap ``snapshot()`` of the latest state.
+
+Controllers speak a line-oriented protocol: the hub sends ``READ`` and the
+controller answers with one JSON line::
+
+    {"t": 5400.0, "zones": {"top": {"temp": 1512.4, "setpoint": 1520.0,
+     "target": 2165, "ramp": 150, "output": 0.82}, ...}}
+
+``t`` is controller time in seconds (local receive time is used when it is
+missing) and ``output`` is the 0-1 duty the controller is calling for.
+Controllers are addressed as ``tcp://host:port`` or
+``serial:///dev/ttyUSB0?baudrate=9600`` (serial needs pyserial-asyncio).
+
+``python telemetry.py simulate`` serves simulated kilns for local testing,
+``python telemetry.py watch`` prints live alerts and
+``python telemetry.py bench`` checks that ingestion keeps up at scale.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
+
+ZONES = ['top', 'middle', 'bottom']
+
+POLL_INTERVAL = 1.0  # seconds between polls of each controller
+READ_TIMEOUT = 2.0
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+STALE_AFTER = 5  # missed polls before a kiln is shown offline
+
+EWMA_ALPHA = 0.05
+RAMP_WINDOW = 60  # samples used to measure the achieved ramp rate
+TARGET_TOLERANCE = 5  # °F from a segment target that counts as reached
+
+ELEMENT_RAMP_RATIO = 0.85  # achieved/programmed ramp below this at full power
+ELEMENT_CLEAR_RATIO = 0.9  # a raised element alert clears only once back above this
+FULL_POWER = 0.9
+RELAY_STALL_RATE = 10  # °F/hr; no real heating while the relay is called on
+RELAY_IDLE_OUTPUT = 0.05
+RELAY_OVERSHOOT = 25  # °F above setpoint while the relay should be off
+ZONE_SPREAD_LIMIT = 50  # °F between hottest and coolest zone
+MAX_EVENTS = 50
+PERSISTENT_ALERT_SECONDS = 300  # an alert active this long is treated as a confirmed fault
+ALERT_CLEAR_SAMPLES = RAMP_WINDOW  # consecutive clean samples before a raised alert clears
+
+
+def _ewma(current, sample, alpha=EWMA_ALPHA):
+    return sample if current is None else current + alpha * (sample - current)
+
+
+def _number(values, field, required=False):
+    """A numeric field from a reading, or None when optional and missing"""
+    value = values.get(field)
+    if value is None and not required:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"bad reading: {field} is {value!r}")
+    return float(value)
+
+
+def parse_reading(reading):
+    """Check a decoded controller reading and return (t, {zone: fields}).
+
+    Raises ValueError for anything that isn't shaped like the protocol, so
+    a confused controller can never half-update the statistics.
+    """
+    if not isinstance(reading, dict) or not isinstance(reading.get('zones'), dict) or not reading['zones']:
+        raise ValueError("bad reading: expected an object with a 'zones' object")
+    t = _number(reading, 't')
+    zones = {}
+    for zone, values in reading['zones'].items():
+        if not isinstance(values, dict):
+            raise ValueError(f"bad reading: zone {zone!r} is {values!r}")
+        zones[str(zone)] = {
+            'temp': _number(values, 'temp', required=True),
+            'setpoint': _number(values, 'setpoint'),
+            'target': _number(values, 'target'),
+            'ramp': _number(values, 'ramp'),
+            'output': _number(values, 'output')
+        }
+    return t, zones
+
+
+class ZoneStats:
+    """Rolling statistics for one kiln zone, updated in O(1) per sample"""
+
+    def __init__(self):
+        self.samples = 0
+        self.temp = None
+        self.setpoint = None
+        self.target = None
+        self.programmed_ramp = None
+        self.output = None
+        self.achieved_ramp = None  # °F/hr over the last RAMP_WINDOW samples
+        self.ramp_ratio = None  # EWMA of achieved/programmed while climbing
+        self.lag = None  # EWMA of setpoint minus temperature
+        self.heating = False
+        self.time_to_temp = None  # seconds the last completed segment took
+        self._history = deque(maxlen=RAMP_WINDOW)
+        self._segment_start = None
+        self._segment_rising = True
+        self._segment_done = False
+
+    def update(self, t, temp, setpoint=None, target=None, ramp=None, output=None):
+        if self._history and t < self._history[-1][0]:
+            # Controller clock went backwards (rebooted): start the window afresh
+            self._restart()
+        self.samples += 1
+        self.temp = temp
+        self.setpoint = setpoint
+        self.programmed_ramp = ramp
+        self.output = output
+
+        if not self._history or t > self._history[-1][0]:
+            # A repeated timestamp is the same controller tick read twice
+            self._history.append((t, temp))
+        oldest_t, oldest_temp = self._history[0]
+        if t > oldest_t:
+            self.achieved_ramp = (temp - oldest_temp) / (t - oldest_t) * 3600
+
+        if setpoint is not None:
+            self.lag = _ewma(self.lag, setpoint - temp)
+
+        if target is not None and target != self.target:
+            self.target = target
+            self._segment_start = t
+            self._segment_rising = target > temp
+            self._segment_done = False
+        if self.target is not None and not self._segment_done:
+            if self._segment_rising:
+                reached = temp >= self.target - TARGET_TOLERANCE
+            else:
+                reached = temp <= self.target + TARGET_TOLERANCE
+            if reached:
+                self.time_to_temp = t - self._segment_start
+                self._segment_done = True
+
+        self.heating = bool(ramp and ramp > 0 and self.target is not None
+                            and temp < self.target - TARGET_TOLERANCE)
+        if self.heating and self.warmed_up:
+            self.ramp_ratio = _ewma(self.ramp_ratio, self.achieved_ramp / ramp)
+
+    def _restart(self):
+        """Forget everything measured against the old clock"""
+        self._history.clear()
+        self.achieved_ramp = None
+        self.ramp_ratio = None
+        self.target = None
+        self._segment_start = None
+        self._segment_rising = True
+        self._segment_done = False
+
+    @property
+    def warmed_up(self):
+        """True once the ramp window is full enough to trust"""
+        return len(self._history) == RAMP_WINDOW and self.achieved_ramp is not None
+
+    def summary(self):
+        return {
+            'temp': self.temp,
+            'setpoint': self.setpoint,
+            'target': self.target,
+            'output': self.output,
+            'programmed_ramp': self.programmed_ramp,
+            'achieved_ramp': self.achieved_ramp,
+            'ramp_ratio': self.ramp_ratio,
+            'lag': self.lag,
+            'heating': self.heating,
+            'time_to_temp': self.time_to_temp,
+            'samples': self.samples
+        }
+
+
+class KilnMonitor:
+    """Zone statistics and live alerts for one kiln"""
+
+    def __init__(self, name):
+        self.name = name
+        self.zones = {}
+        self.spread = None  # EWMA of hottest minus coolest zone
+        self.online = False
+        self.error = ''
+        self.last_seen = None
+        self.samples = 0
+        self.alerts = {}  # (kind, zone) -> alert
+        self.events = deque(maxlen=MAX_EVENTS)
+        self._clean_samples = {}  # (kind, zone) -> samples a raised alert's condition has been clear
+
+    def ingest(self, reading, received=None):
+        """Fold one controller reading into the rolling statistics"""
+        received = time.time() if received is None else received
+        t, zones = parse_reading(reading)
+        if t is None:
+            t = received
+        temps = []
+        for zone, values in zones.items():
+            stats = self.zones.get(zone)
+            if stats is None:
+                stats = self.zones[zone] = ZoneStats()
+            stats.update(t, **values)
+            temps.append(stats.temp)
+        if temps:
+            self.spread = _ewma(self.spread, max(temps) - min(temps))
+        self.online = True
+        self.error = ''
+        self.last_seen = received
+        self.samples += 1
+        self._check_alerts(received)
+
+    def mark_offline(self, error):
+        self.online = False
+        self.error = error
+
+    def _check_alerts(self, now):
+        """Raise, refresh and clear alerts, with hysteresis so noisy readings don't flap them.
+
+        A raised alert survives until its condition has been clear for
+        ALERT_CLEAR_SAMPLES samples in a row; it keeps its ``raised_at`` and
+        logs no new event if the condition returns in the meantime.
+        """
+        active = {}
+        for zone, stats in self.zones.items():
+            if not stats.warmed_up:
+                continue
+            full_power = stats.output is None or stats.output >= FULL_POWER
+            # A weak element has to recover past a margin, not just the threshold
+            element_limit = ELEMENT_CLEAR_RATIO if ('element', zone) in self.alerts else ELEMENT_RAMP_RATIO
+            if stats.heating and full_power and stats.achieved_ramp <= RELAY_STALL_RATE:
+                active[('relay', zone)] = (
+                    f"{zone.title()} zone is not heating ({stats.achieved_ramp:.0f}°F/hr) "
+                    "while the controller calls for full power. Check the relay."
+                )
+            elif (stats.heating and full_power and stats.ramp_ratio is not None and stats.ramp_ratio < element_limit
+                  # A dead relay already explains a missing ramp
+                  and ('relay', zone) not in self.alerts):
+                active[('element', zone)] = (
+                    f"{zone.title()} zone is reaching only {stats.ramp_ratio:.0%} of its programmed ramp "
+                    "at full power. Elements are weakening."
+                )
+            elif (stats.output is not None and stats.output <= RELAY_IDLE_OUTPUT and stats.setpoint is not None
+                  and stats.temp > stats.setpoint + RELAY_OVERSHOOT and stats.achieved_ramp > RELAY_STALL_RATE):
+                active[('relay', zone)] = (
+                    f"{zone.title()} zone keeps climbing {stats.temp - stats.setpoint:.0f}°F above setpoint "
+                    "with its output off. The relay may be stuck closed."
+                )
+        if self.spread is not None and self.spread > ZONE_SPREAD_LIMIT and len(self.zones) > 1:
+            active[('spread', None)] = f"Zones are {self.spread:.0f}°F apart."
+
+        for key in list(self.alerts):
+            if key in active:
+                self._clean_samples.pop(key, None)
+                continue
+            clean = self._clean_samples.get(key, 0) + 1
+            if clean >= ALERT_CLEAR_SAMPLES:
+                del self.alerts[key]
+                self._clean_samples.pop(key, None)
+            else:
+                self._clean_samples[key] = clean
+                self.alerts[key]['persistent'] = now - self.alerts[key]['raised_at'] >= PERSISTENT_ALERT_SECONDS
+        for key, message in active.items():
+            alert = self.alerts.get(key)
+            if alert is None:
+                alert = self.alerts[key] = {
+                    'kiln': self.name,
+                    'kind': key[0],
+                    'zone': key[1],
+                    'since': datetime.fromtimestamp(now).isoformat(timespec='seconds'),
+                    'raised_at': now,
+                    'persistent': False
+                }
+                self.events.append(dict(alert, message=message))
+            alert['message'] = message
+            alert['persistent'] = now - alert['raised_at'] >= PERSISTENT_ALERT_SECONDS
+
+    def summary(self):
+        return {
+            'name': self.name,
+            'online': self.online,
+            'error': self.error,
+            'last_seen': self.last_seen,
+            'samples': self.samples,
+            'spread': self.spread,
+            'zones': {zone: stats.summary() for zone, stats in self.zones.items()},
+            'alerts': [dict(alert) for alert in self.alerts.values()],
+            'events': list(self.events)
+        }
+
+
+def parse_controllers(spec):
+    """Parse ``name=url,name=url`` into a {name: url} mapping"""
+    controllers = {}
+    for i, entry in enumerate(part.strip() for part in spec.split(',')):
+        if not entry:
+            continue
+        name, sep, url = entry.partition('=')
+        if not sep:
+            name, url = f"Kiln {i + 1}", entry
+        controllers[name.strip()] = url.strip()
+    return controllers
+
+
+async def open_controller(url):
+    """Open a (reader, writer) stream pair to a controller URL"""
+    parsed = urlparse(url)
+    if parsed.scheme == 'tcp':
+        return await asyncio.open_connection(parsed.hostname, parsed.port)
+    if parsed.scheme == 'serial':
+        try:
+            import serial_asyncio
+        except ImportError:
+            raise RuntimeError("Serial controllers need pyserial-asyncio: pip install pyserial-asyncio")
+        options = parse_qs(parsed.query)
+        baudrate = int(options.get('baudrate', ['9600'])[0])
+        return await serial_asyncio.open_serial_connection(url=parsed.path, baudrate=baudrate)
+    raise ValueError(f"Unsupported controller address: {url}")
+
+
+class TelemetryHub:
+    """Polls all controllers from a background asyncio loop"""
+
+    def __init__(self, controllers, interval=POLL_INTERVAL, timeout=READ_TIMEOUT):
+        self.controllers = dict(controllers)
+        self.interval = interval
+        self.timeout = timeout
+        self.monitors = {name: KilnMonitor(name) for name in self.controllers}
+        self.late_polls = 0  # polls that started a full interval behind schedule
+        self._lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+        self._stop = None
+
+    def start(self):
+        if self._thread is not None or not self.controllers:
+            return self
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name='kiln-telemetry', daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join()
+        self._thread = None
+
+    def snapshot(self):
+        """Plain-dict copy of every kiln's latest state, safe to render"""
+        now = time.time()
+        with self._lock:
+            kilns = {name: monitor.summary() for name, monitor in self.monitors.items()}
+        for kiln in kilns.values():
+            # A kiln whose readings stopped arriving must not look live
+            if kiln['online'] and now - kiln['last_seen'] > STALE_AFTER * self.interval:
+                kiln['online'] = False
+                kiln['error'] = f"no reading for {now - kiln['last_seen']:.0f}s"
+        return kilns
+
+    def alerts(self):
+        with self._lock:
+            return [dict(alert) for monitor in self.monitors.values() for alert in monitor.alerts.values()]
+
+    def _run(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._stop = asyncio.Event()
+        ready.set()
+        try:
+            self._loop.run_until_complete(asyncio.gather(
+                *(self._supervise(name, url) for name, url in self.controllers.items()),
+                return_exceptions=True
+            ))
+        finally:
+            self._loop.close()
+
+    async def _wait(self, delay):
+        """Sleep for ``delay`` seconds; returns True if the hub is stopping"""
+        try:
+            await asyncio.wait_for(self._stop.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+        return self._stop.is_set()
+
+    async def _supervise(self, name, url):
+        """Keep one kiln's poller running; a bug it trips over must not stop the others"""
+        while not self._stop.is_set():
+            try:
+                await self._poll(name, url)
+            except Exception as exc:
+                with self._lock:
+                    self.monitors[name].mark_offline(f"{type(exc).__name__}: {exc}")
+                if await self._wait(MAX_RECONNECT_DELAY):
+                    return
+
+    async def _poll(self, name, url):
+        monitor = self.monitors[name]
+        loop = asyncio.get_running_loop()
+        backoff = RECONNECT_DELAY
+        # Spread the first polls so many kilns don't all fire at once
+        if await self._wait(random.uniform(0, self.interval)):
+            return
+        while not self._stop.is_set():
+            writer = None
+            try:
+                reader, writer = await asyncio.wait_for(open_controller(url), self.timeout)
+                backoff = RECONNECT_DELAY
+                next_poll = loop.time()
+                while True:
+                    writer.write(b"READ\n")
+                    await writer.drain()
+                    line = await asyncio.wait_for(reader.readline(), self.timeout)
+                    if not line:
+                        raise ConnectionError("controller closed the connection")
+                    reading = json.loads(line)
+                    with self._lock:
+                        monitor.ingest(reading)
+
+                    next_poll += self.interval
+                    delay = next_poll - loop.time()
+                    if delay < 0:
+                        # Fell behind: skip the missed polls instead of bursting
+                        if delay < -self.interval:
+                            self.late_polls += 1
+                        next_poll = loop.time()
+                        delay = 0
+                    if await self._wait(delay):
+                        return
+            except (OSError, asyncio.TimeoutError, ValueError, KeyError, TypeError, AttributeError, RuntimeError) as exc:
+                with self._lock:
+                    monitor.mark_offline(str(exc) or type(exc).__name__)
+                if await self._wait(backoff):
+                    return
+                backoff = min(backoff * 2, MAX_RECONNECT_DELAY)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+
+class SimulatedKiln:
+    """Rough electric kiln model for exercising the telemetry pipeline.
+
+    Every zone follows a single ramp to ``target`` and then holds. Zones in
+    ``element_health`` heat at that fraction of full power, and zones in
+    ``dead_relays`` get no power at all and cool towards room temperature.
+    ``time_scale`` runs the firing faster than real time.
+    """
+
+    POWER_MARGIN = 1.15  # healthy elements out-climb the programmed ramp by this much
+    GAIN = 6.0  # 1/hr, how hard the controller chases the setpoint
+    COOLING = 0.3  # 1/hr, heat loss rate towards room temperature
+    ROOM_TEMP = 70.0
+
+    def __init__(self, ramp=150, target=2165, element_health=None, dead_relays=(),
+                 time_scale=60.0, noise=0.3, seed=None):
+        self.ramp = ramp
+        self.target = target
+        self.element_health = dict(element_health or {})
+        self.dead_relays = set(dead_relays)
+        self.time_scale = time_scale
+        self.noise = noise
+        self.rng = random.Random(seed)
+        self.elapsed = 0.0
+        self.temps = {zone: self.ROOM_TEMP for zone in ZONES}
+        self._clock = time.monotonic()
+
+    def read(self):
+        now = time.monotonic()
+        dt = (now - self._clock) * self.time_scale
+        self._clock = now
+        self.elapsed += dt
+        setpoint = min(self.target, self.ROOM_TEMP + self.ramp * self.elapsed / 3600)
+
+        zones = {}
+        for zone in ZONES:
+            temp = self.temps[zone]
+            max_rate = self.ramp * self.POWER_MARGIN
+            wanted = self.ramp * (setpoint < self.target) + (setpoint - temp) * self.GAIN
+            output = min(1.0, max(0.0, wanted / max_rate))
+            power = 0.0 if zone in self.dead_relays else self.element_health.get(zone, 1.0)
+            rate = output * max_rate * power - (temp - self.ROOM_TEMP) * self.COOLING * (zone in self.dead_relays)
+            self.temps[zone] = temp + rate * dt / 3600
+            zones[zone] = {
+                'temp': round(self.temps[zone] + self.rng.gauss(0, self.noise), 1),
+                'setpoint': round(setpoint, 1),
+                'target': self.target,
+                'ramp': self.ramp,
+                'output': round(output, 3)
+            }
+        return {'t': round(self.elapsed, 3), 'zones': zones}
+
+
+async def serve_simulator(kiln, host='127.0.0.1', port=0):
+    """Serve one simulated kiln; returns the asyncio server"""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip().upper() == b'READ':
+                    writer.write(json.dumps(kiln.read()).encode() + b"\n")
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+def _parse_faults(entries, cast):
+    """Parse ``kiln:zone=value`` / ``kiln:zone`` fault options"""
+    faults = {}
+    for entry in entries or []:
+        target, _, value = entry.partition('=')
+        kiln, _, zone = target.partition(':')
+        faults.setdefault(kiln, {})[zone] = cast(value) if value else None
+    return faults
+
+
+async def _simulate(args):
+    weak = _parse_faults(args.weak, float)
+    dead = _parse_faults(args.dead_relay, str)
+    servers = []
+    for i in range(args.kilns):
+        name = f"kiln-{i + 1}"
+        kiln = SimulatedKiln(
+            ramp=args.ramp, target=args.target, element_health=weak.get(name),
+            dead_relays=dead.get(name, {}), time_scale=args.time_scale, seed=i
+        )
+        server = await serve_simulator(kiln, args.host, args.port + i)
+        servers.append(server)
+        print(f"{name}=tcp://{args.host}:{args.port + i}")
+    print("Simulating, press Ctrl+C to stop", flush=True)
+    await asyncio.gather(*(server.serve_forever() for server in servers))
+
+
+def _watch(args):
+    hub = TelemetryHub(parse_controllers(','.join(args.controllers)), interval=args.interval).start()
+    seen = set()
+    try:
+        while True:
+            time.sleep(args.interval)
+            for name, kiln in hub.snapshot().items():
+                for event in kiln['events']:
+                    key = (name, event['kind'], event['zone'], event['since'])
+                    if key not in seen:
+                        seen.add(key)
+                        print(f"[{event['since']}] {name}: {event['message']}", flush=True)
+                if not kiln['online'] and kiln['error']:
+                    print(f"{name}: offline ({kiln['error']})", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        hub.stop()
+
+
+# Readings a confused controller might send; bench mixes these in
+MALFORMED_READINGS = [
+    {'zones': {'top': {'temp': None}}},
+    {'zones': 'top=1500'},
+    [1500, 1510, 1495],
+]
+
+
+class MalformedController:
+    """Answers every READ with the same badly shaped reading"""
+
+    def __init__(self, reading):
+        self.reading = reading
+
+    def read(self):
+        return self.reading
+
+
+def _bench(args):
+    """Serve many simulated kilns and poll them all from one hub.
+
+    Every tenth kiln has weak top elements, and the run fails unless
+    exactly those kilns get an element alert. Also serves ``--malformed``
+    controllers sending bad readings, and fails if they knock any healthy
+    kiln off its polling schedule.
+    """
+    loop = asyncio.new_event_loop()
+    controllers = {}
+    weak = set()
+    for i in range(args.kilns):
+        name = f"kiln-{i + 1}"
+        if i % 10 == 0:
+            weak.add(name)
+        kiln = SimulatedKiln(time_scale=args.time_scale, seed=i,
+                             element_health={'top': 0.6} if name in weak else None)
+        server = loop.run_until_complete(serve_simulator(kiln))
+        controllers[name] = f"tcp://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    malformed = []
+    for i in range(args.malformed):
+        bad = MalformedController(MALFORMED_READINGS[i % len(MALFORMED_READINGS)])
+        server = loop.run_until_complete(serve_simulator(bad))
+        malformed.append(f"malformed-{i + 1}")
+        controllers[malformed[-1]] = f"tcp://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    hub = TelemetryHub(controllers, interval=args.interval).start()
+    time.sleep(args.seconds)
+    snapshot = hub.snapshot()
+    hub_alive = hub._thread.is_alive()
+    hub.stop()
+    loop.call_soon_threadsafe(loop.stop)
+
+    for name in malformed:
+        snapshot.pop(name)
+    samples = sum(kiln['samples'] for kiln in snapshot.values())
+    expected = args.kilns * args.seconds / args.interval
+    zone_samples = sum(zone['samples'] for kiln in snapshot.values() for zone in kiln['zones'].values())
+    flagged = sorted(name for name, kiln in snapshot.items() if kiln['alerts'])
+    print(f"kilns:               {args.kilns}")
+    print(f"polls:               {samples} of ~{expected:.0f} scheduled ({samples / expected:.0%})")
+    print(f"zone samples/s:      {zone_samples / args.seconds:.0f}")
+    print(f"late polls:          {hub.late_polls}")
+    print(f"offline kilns:       {sum(not kiln['online'] for kiln in snapshot.values())}")
+    print(f"kilns with alerts:   {len(flagged)}")
+
+    failed = False
+    # The first poll is jittered by up to one interval, then the ramp window has to fill
+    warm_up = (RAMP_WINDOW + 2) * args.interval
+    if args.seconds < warm_up:
+        print(f"weak elements:       not checked (run at least {warm_up:.0f}s to fill the ramp window)")
+    else:
+        element_alerts = {name for name, kiln in snapshot.items()
+                          if any(alert['kind'] == 'element' for alert in kiln['alerts'])}
+        missed = weak - element_alerts
+        false_alarms = element_alerts - weak
+        ok = not missed and not false_alarms
+        failed |= not ok
+        print(f"weak elements:       {'ok' if ok else 'FAILED'} "
+              f"({len(weak & element_alerts)} of {len(weak)} flagged, {len(false_alarms)} false alarms)")
+
+    if malformed:
+        lagging = [name for name, kiln in snapshot.items()
+                   if kiln['samples'] < (args.seconds / args.interval - 1) * 0.9]
+        ok = hub_alive and not lagging
+        failed |= not ok
+        print(f"malformed isolated:  {'ok' if ok else 'FAILED'} "
+              f"({len(malformed)} bad controllers, {len(lagging)} healthy kilns fell behind)")
+
+    if failed:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KilnMaster Pro controller telemetry tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    simulate = commands.add_parser('simulate', help="serve simulated kiln controllers over TCP")
+    simulate.add_argument('--kilns', type=int, default=3)
+    simulate.add_argument('--host', default='127.0.0.1')
+    simulate.add_argument('--port', type=int, default=9100, help="port of the first kiln; the rest follow")
+    simulate.add_argument('--ramp', type=float, default=150, help="programmed ramp in °F/hr")
+    simulate.add_argument('--target', type=float, default=2165, help="target temperature in °F")
+    simulate.add_argument('--time-scale', type=float, default=60, help="simulated seconds per real second")
+    simulate.add_argument('--weak', action='append', metavar='KILN:ZONE=HEALTH',
+                          help="weaken a zone's elements, e.g. kiln-2:top=0.7")
+    simulate.add_argument('--dead-relay', action='append', metavar='KILN:ZONE',
+                          help="fail a zone's relay open, e.g. kiln-3:bottom")
+
+    watch = commands.add_parser('watch', help="poll controllers and print alerts as they happen")
+    watch.add_argument('controllers', nargs='+', metavar='NAME=URL')
+    watch.add_argument('--interval', type=float, default=POLL_INTERVAL)
+
+    bench = commands.add_parser('bench', help="check ingestion keeps up with many simulated kilns")
+    bench.add_argument('--kilns', type=int, default=200)
+    bench.add_argument('--seconds', type=float, default=90,
+                       help=f"run length; alerts need the {RAMP_WINDOW}-sample ramp window to fill first")
+    bench.add_argument('--interval', type=float, default=POLL_INTERVAL)
+    bench.add_argument('--time-scale', type=float, default=60)
+    bench.add_argument('--malformed', type=int, default=3,
+                       help="controllers sending bad readings alongside the healthy kilns")
+
+    args = parser.parse_args()
+    if args.command == 'simulate':
+        try:
+            asyncio.run(_simulate(args))
+        except KeyboardInterrupt:
+            pass
+    elif args.command == 'watch':
+        _watch(args)
+    else:
+        _bench(args)
+
+
+if __name__ == "__main__":
+    main()